@@ -1,25 +1,54 @@
 import os
+import gzip
 import asyncio
-from flask import request, jsonify, send_file
+import logging
+from io import BytesIO
+from datetime import datetime
+from typing import Optional
+from flask import Response, request, jsonify, send_file
 from werkzeug.datastructures import FileStorage
 from dotenv import load_dotenv
 
 from data.data_manager import DataManager
 from services.weather_service import WeatherService
 from services.geolocation_service import GeolocationService
-from services.data_enrichment_service import enrich_all_cities, enrich_single_city
+from services.data_enrichment_service import (
+    enrich_all_cities,
+    enrich_single_city,
+    summarize_enrichment,
+)
 from core.utils import is_valid_coordinates
 
+logger = logging.getLogger(__name__)
+
 # Loading path to save
 load_dotenv()
 CITIES_CSV_PATH = os.getenv("CITIES_CSV_PATH", "data/cities.csv")
 
+# Exports above this size are gzip-compressed for clients that accept it
+EXPORT_GZIP_MIN_BYTES = 64 * 1024
+
 # Global service instances
 data_manager = DataManager()
 geo_service = GeolocationService()
 weather_service = WeatherService()
 
 
+def _not_modified(
+    etag: Optional[str], last_modified: datetime
+) -> Optional[Response]:
+    """
+    Returns a 304 response if the client's cached copy (If-None-Match) is current.
+    """
+    if etag is None or not request.if_none_match.contains(etag):
+        return None
+
+    response = Response(status=304)
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    return response
+
+
 def register_routes(app):
     """
     Registers all API endpoints to the given Flask app instance.
@@ -53,7 +82,7 @@ def register_routes(app):
 
         try:
             data_manager.load_cities_from_csv_file(file)
-            count = len(data_manager.df)
+            count = data_manager.snapshot().nrows
 
             return (
                 jsonify(
@@ -92,31 +121,23 @@ def register_routes(app):
             city_names = data_manager.get_cities_names()
             
             # Enrich the loaded cities
-            enriched_results = await enrich_all_cities(city_names)
+            enriched_results = await enrich_all_cities(
+                city_names, geo_service, weather_service
+            )
             had_failures = data_manager.update_df_with_enrichment(enriched_results)
 
-            enriched_count = len(data_manager.df)
-            failed_count = len(city_names) - enriched_count
-            failed_cities = [
-                item["city_name"]
-                for item in enriched_results
-                if "error" in item and item["error"] is not None
-            ]
-
             response_body = {
                 "message": "Upload and enrichment completed"
                 + (" with some errors." if had_failures else " successfully."),
-                "enriched_count": enriched_count,
-                "failed_count": failed_count,
-                "failed_cities": failed_cities,
+                **summarize_enrichment(enriched_results),
             }
 
             return jsonify(response_body), 207 if had_failures else 200
 
         except ValueError as ve:
             return jsonify({"error": str(ve)}), 400
-        except Exception as e:
-            print(f"[ERROR] {e}")
+        except Exception:
+            logger.exception("upload_and_enrich failed")
             return (
                 jsonify({"error": "Unexpected error during upload and enrichment"}),
                 500,
@@ -134,29 +155,21 @@ def register_routes(app):
             422 Unprocessable Entity: No cities loaded.
             500 Internal Server Error: Enrichment process failed unexpectedly.
         """
-        if data_manager.df is None or data_manager.df.empty:
+        if not data_manager.snapshot().has_data:
             return jsonify({"error": "No cities loaded"}), 422
 
         try:
             city_names = data_manager.get_cities_names()
-            enriched_results = await enrich_all_cities(city_names)
+            enriched_results = await enrich_all_cities(
+                city_names, geo_service, weather_service
+            )
 
             had_failures = data_manager.update_df_with_enrichment(enriched_results)
 
-            enriched_count = len(data_manager.df)
-            failed_count = len(city_names) - enriched_count
-            failed_cities = [
-                item["city_name"]
-                for item in enriched_results
-                if "error" in item and item["error"] is not None
-            ]
-
             response_body = {
                 "message": "Enrichment completed"
                 + (" with some errors." if had_failures else " successfully."),
-                "enriched_count": enriched_count,
-                "failed_count": failed_count,
-                "failed_cities": failed_cities,
+                **summarize_enrichment(enriched_results),
             }
 
             return jsonify(response_body), 207 if had_failures else 200
@@ -186,7 +199,7 @@ def register_routes(app):
 
             city_name = data["city_name"]
             added = data_manager.add_city(city_name)
-            total = len(data_manager.df)
+            total = data_manager.snapshot().nrows
 
             if not added:
                 return (
@@ -223,7 +236,7 @@ def register_routes(app):
                 jsonify(
                     {
                         "message": f"City '{city_name}' added and enriched successfully.",
-                        "total_cities": len(data_manager.df),
+                        "total_cities": data_manager.snapshot().nrows,
                         "new": True,
                     }
                 ),
@@ -232,8 +245,8 @@ def register_routes(app):
 
         except ValueError as ve:
             return jsonify({"error": str(ve)}), 400
-        except Exception as e:
-            print(f"[ERROR] {e}")
+        except Exception:
+            logger.exception("add_city failed")
             return jsonify({"error": "Failed to add city"}), 500
 
     @app.route("/closest-city", methods=["POST"])
@@ -259,13 +272,13 @@ def register_routes(app):
             if not data or "lat" not in data or "lon" not in data:
                 return jsonify({"error": "Missing 'lat' or 'lon' in request body"}), 400
 
-            lat = data["lat"]
-            lon = data["lon"]
-
-            if not is_valid_coordinates(lat, lon):
+            if not is_valid_coordinates(data["lat"], data["lon"]):
                 return jsonify({"error": "Invalid 'lon' or 'lat' value"}), 400
 
-            if data_manager.df is None or data_manager.df.empty:
+            lat = float(data["lat"])
+            lon = float(data["lon"])
+
+            if not data_manager.snapshot().has_data:
                 return jsonify({"error": "No cities loaded"}), 422
 
             result = await data_manager.find_closest_city(
@@ -294,11 +307,11 @@ def register_routes(app):
             500 Internal Server Error: Deletion failed.
         """
         try:
-            if data_manager.df is None or data_manager.df.empty:
+            if not data_manager.snapshot().has_data:
                 return jsonify({"error": "No cities loaded"}), 422
 
             data_manager.remove_city(city_name)
-            total = len(data_manager.df)
+            total = data_manager.snapshot().nrows
 
             return (
                 jsonify(
@@ -320,15 +333,40 @@ def register_routes(app):
         """
         Returns the list of all cities as JSON.
         Each record includes city_name, coordinates and weather (if enriched).
+        Bulk clients may send `Accept: text/csv` to get the same data as CSV.
+
+        Supports conditional requests via ETag / If-None-Match.
 
         Returns:
             200 OK: Full list of cities.
+            304 Not Modified: Client's cached copy is current.
             422 Unprocessable Entity: No data available.
             500 Internal Server Error: Retrieval failed.
         """
         try:
-            data = data_manager.to_send()
-            return jsonify({"cities": data, "count": len(data)}), 200
+            wants_csv = (
+                request.accept_mimetypes.best_match(["application/json", "text/csv"])
+                == "text/csv"
+            )
+
+            # Validators and body come from the same data version;
+            # each representation of the content has its own strong ETag
+            etag, last_modified, body = data_manager.representation(
+                "csv" if wants_csv else "json"
+            )
+            if wants_csv:
+                etag = f"{etag}-csv"
+            not_modified = _not_modified(etag, last_modified)
+            if not_modified is not None:
+                return not_modified
+
+            response = Response(
+                body, mimetype="text/csv" if wants_csv else "application/json"
+            )
+            response.set_etag(etag)
+            response.last_modified = last_modified
+            response.vary.add("Accept")
+            return response
         except ValueError as ve:
             return jsonify({"error": str(ve)}), 422
         except Exception:
@@ -345,7 +383,7 @@ def register_routes(app):
             500 Internal Server Error: File save failed.
         """
         try:
-            if data_manager.df is None or data_manager.df.empty:
+            if not data_manager.snapshot().has_data:
                 return jsonify({"error": "No data to save."}), 422
 
             data_manager.save_cities_to_csv(CITIES_CSV_PATH)
@@ -366,28 +404,55 @@ def register_routes(app):
     @app.route("/export-cities", methods=["GET"])
     def export_cities():
         """
-        Sends the saved CSV file as a download.
-        If file doesn't exist, attempts to create it from memory.
+        Sends the in-memory city list as a CSV download.
+        The CSV is built in memory; nothing is written to disk.
+        Large exports are gzip-compressed when the client accepts it.
+
+        Supports conditional requests via ETag / If-None-Match
+        and partial downloads via Range.
 
         Returns:
             200 OK: CSV file as attachment.
+            206 Partial Content: Requested byte range of the CSV.
+            304 Not Modified: Client's cached copy is current.
             404 Not Found: No data available to export.
-            500 Internal Server Error: Save or file read failed.
+            500 Internal Server Error: CSV generation failed.
         """
-
-        # If file does not exist, try to save it from memory if available
-        if data_manager.df is None or data_manager.df.empty:
+        if not data_manager.snapshot().has_data:
             return jsonify({"error": "No data available to export"}), 404
 
+        # Validators and body come from the same data version
         try:
-            data_manager.save_cities_to_csv(CITIES_CSV_PATH)
+            etag, last_modified, body = data_manager.representation("csv")
+        except ValueError:
+            return jsonify({"error": "No data available to export"}), 404
         except Exception:
-            return jsonify({"error": "Failed to save cities before export"}), 500
+            return jsonify({"error": "Failed to build CSV export"}), 500
+
+        # Each encoding of the content has its own strong ETag
+        gzip_etag = f"{etag}-gzip"
+        for cached_etag in (etag, gzip_etag):
+            not_modified = _not_modified(cached_etag, last_modified)
+            if not_modified is not None:
+                return not_modified
+
+        use_gzip = (
+            len(body) >= EXPORT_GZIP_MIN_BYTES and "gzip" in request.accept_encodings
+        )
+        if use_gzip:
+            body = gzip.compress(body, compresslevel=6)
+            etag = gzip_etag
 
-        # Return the file as an attachment
-        return send_file(
-            CITIES_CSV_PATH,
+        response = send_file(
+            BytesIO(body),
             mimetype="text/csv",
             as_attachment=True,
             download_name="cities.csv",
+            conditional=True,
+            etag=etag,
+            last_modified=last_modified,
         )
+        response.vary.add("Accept-Encoding")
+        if use_gzip:
+            response.headers["Content-Encoding"] = "gzip"
+        return response
@@ -1,12 +1,18 @@
+import os
 from flask import Flask, request
 from api.endpoints import register_routes
+from core.json_provider import OrjsonProvider
+from core.logging_setup import configure_logging
 
 
 def create_app():
     """
     Factory function to create and configure the Flask app.
     """
+    configure_logging()
     app = Flask(__name__)
+    # jsonify() and request.get_json() go through orjson
+    app.json = OrjsonProvider(app)
     register_routes(app)
 
     # Add global cache headers
@@ -22,5 +28,6 @@ def create_app():
 
 
 if __name__ == "__main__":
+    # Development server only; use gunicorn (see gunicorn.conf.py) in production
     app = create_app()
-    app.run(debug=True, host="0.0.0.0", port=5005)
+    app.run(debug=os.getenv("FLASK_DEBUG") == "1", host="0.0.0.0", port=5005)
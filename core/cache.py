@@ -0,0 +1,177 @@
+import asyncio
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    A small in-memory LRU cache whose entries expire after a fixed time-to-live.
+    The least recently used entry is evicted once `maxsize` is reached.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        """
+        Args:
+            maxsize (int): Maximum number of entries kept.
+            ttl (float): Seconds an entry stays valid after being stored.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        # The service singletons share this cache across the server threads
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Returns the cached value for `key`, or `default` if missing or expired.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Stores `value` under `key`, evicting the least recently used entry if full.
+        """
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+class SQLiteStore:
+    """
+    Persistent key/value store with per-entry expiry, backed by a single SQLite table,
+    so cached API results survive process restarts. Several stores can share one file
+    under different namespaces. Keys are stored by repr(), values pickled.
+    """
+
+    def __init__(self, path: str, namespace: str) -> None:
+        """
+        Args:
+            path (str): SQLite database file (created if missing).
+            namespace (str): Separates the entries of different caches in the file.
+        """
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        # Shared by the server threads; access is serialized by the lock
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "namespace TEXT, key TEXT, expires_at REAL, value BLOB, "
+            "PRIMARY KEY (namespace, key))"
+        )
+        self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Returns the stored value for `key`, or `default` if missing or expired.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires_at, value FROM cache WHERE namespace = ? AND key = ?",
+                (self.namespace, repr(key)),
+            ).fetchone()
+
+        if row is None or row[0] <= time.time():
+            return default
+        return pickle.loads(row[1])
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """
+        Stores `value` under `key` for `ttl` seconds of wall-clock time.
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)",
+                (self.namespace, repr(key), time.time() + ttl, pickle.dumps(value)),
+            )
+
+
+class AsyncTTLCache(TTLCache):
+    """
+    TTLCache for coroutine results with single-flight semantics:
+    concurrent lookups of the same missing key share one in-flight fetch.
+    None results are not cached, so failed lookups are retried next time.
+
+    With a `store`, results are also written through to it, and memory misses
+    are served from it before fetching.
+    """
+
+    def __init__(
+        self, maxsize: int, ttl: float, store: Optional[SQLiteStore] = None
+    ) -> None:
+        """
+        Args:
+            maxsize (int): Maximum number of entries kept in memory.
+            ttl (float): Seconds an entry stays valid after being stored.
+            store (SQLiteStore, optional): Persistent second level.
+        """
+        super().__init__(maxsize, ttl)
+        self.store = store
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+
+    async def get_or_fetch(
+        self, key: Hashable, fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Returns the cached value for `key`, awaiting `fetch()` on a miss.
+
+        Args:
+            key (Hashable): Cache key.
+            fetch (Callable[[], Awaitable[Any]]): Produces the value on a cache miss.
+
+        Returns:
+            Any: The cached or freshly fetched value.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        if self.store is not None:
+            value = self.store.get(key, _MISSING)
+            if value is not _MISSING:
+                self.set(key, value)
+                return value
+
+        loop = asyncio.get_running_loop()
+        pending = self._inflight.get(key)
+        # Each Flask async view runs its own event loop; only join fetches from ours
+        if pending is not None and pending.get_loop() is loop:
+            return await asyncio.shield(pending)
+
+        task = loop.create_task(fetch())
+        self._inflight[key] = task
+        try:
+            value = await task
+        finally:
+            if self._inflight.get(key) is task:
+                del self._inflight[key]
+
+        if value is not None:
+            self.set(key, value)
+            if self.store is not None:
+                self.store.set(key, value, self.ttl)
+        return value
@@ -1,6 +1,9 @@
 import math
+import numpy as np
 import pandas as pd
 
+EARTH_RADIUS_KM = 6371
+
 
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
@@ -16,7 +19,7 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     Returns:
         float: Distance in kilometers.
     """
-    R = 6371  # Earth radius in kilometers
+    R = EARTH_RADIUS_KM
 
     phi1 = math.radians(lat1)
     phi2 = math.radians(lat2)
@@ -32,10 +35,31 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     return R * c
 
 
+def to_unit_vectors(lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """
+    Converts latitude/longitude pairs (degrees) into ECEF (x, y, z) points
+    on the unit sphere. The dot product of two such points is the cosine of
+    their central angle, so the largest dot product marks the nearest point.
+
+    Args:
+        lats (np.ndarray): Latitudes in degrees.
+        lons (np.ndarray): Longitudes in degrees.
+
+    Returns:
+        np.ndarray: Array of shape (..., 3) with the unit vectors.
+    """
+    phi = np.radians(lats)
+    lam = np.radians(lons)
+    cos_phi = np.cos(phi)
+    return np.stack(
+        [cos_phi * np.cos(lam), cos_phi * np.sin(lam), np.sin(phi)], axis=-1
+    )
+
+
 def is_valid_coordinates(lat: float, lon: float) -> bool:
     """
-    Validates whether the given latitude and longitude values are within valid Earth ranges
-    and are numeric types.
+    Validates whether the given latitude and longitude values are finite numbers
+    (or numeric strings) within valid Earth ranges.
 
     Args:
         lat (float): Latitude to check.
@@ -44,6 +68,24 @@ def is_valid_coordinates(lat: float, lon: float) -> bool:
     Returns:
         bool: True if valid, False otherwise.
     """
-    if not isinstance(lat, (int, float)) or not isinstance(lon, (int, float)):
+    try:
+        lat = float(lat)
+        lon = float(lon)
+    except (TypeError, ValueError, OverflowError):
         return False
-    return -90 <= lat <= 90 and -180 <= lon <= 180
+    # NaN fails every comparison, infinities fail the range check
+    return -90.0 <= lat <= 90.0 and -180.0 <= lon <= 180.0
+
+
+def normalize_city_name(city_name: str) -> str:
+    """
+    Normalizes a city name for storage and lookups: trims surrounding
+    whitespace and casefolds it, so "  Tel Aviv" and "tel aviv" are the same city.
+
+    Args:
+        city_name (str): Raw city name.
+
+    Returns:
+        str: Normalized city name.
+    """
+    return city_name.strip().casefold()
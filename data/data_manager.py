@@ -1,12 +1,49 @@
 from __future__ import annotations
 
+import functools
+import hashlib
+import threading
+import numpy as np
+import orjson
 import pandas as pd
-from io import BytesIO
-from typing import Optional
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Iterable, Optional
 from werkzeug.datastructures import FileStorage
 from services.geolocation_service import GeolocationService
 from services.weather_service import WeatherService
-from core.utils import haversine_distance
+from core.utils import haversine_distance, normalize_city_name, to_unit_vectors
+
+# Rows parsed per chunk when reading uploaded CSVs
+CSV_CHUNK_SIZE = 50_000
+
+# Numeric columns are pinned to float64 so vectorized paths never see int/object data
+FLOAT_COLUMNS = ("latitude", "longitude", "temperature")
+
+
+@dataclass(frozen=True, slots=True)
+class Snapshot:
+    """
+    Immutable summary of the DataManager state, replaced on every mutation.
+    Lets endpoints check the state with one call, without touching pandas.
+    """
+
+    nrows: int
+    has_data: bool
+    last_modified: datetime
+
+
+def _locked(method):
+    """
+    Runs a DataManager method while holding the instance lock.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
 
 
 class DataManager:
@@ -21,13 +58,187 @@ class DataManager:
         """
         Initializes the DataManager with an empty DataFrame.
         """
-        self.df: Optional[pd.DataFrame] = None
+        self._df: Optional[pd.DataFrame] = None
+        self._nrows = 0
+        # Normalized city name -> row label, for O(1) membership tests and row lookups
+        self._name_index: Optional[dict[str, int]] = None
+        # Cities added since the DataFrame was last materialized (see add_city)
+        self._pending: list[str] = []
+        # Label given to the next added row; labels stay stable across removals
+        self._next_label = 0
+        # Serializes mutations between concurrent requests (threaded server)
+        self._lock = threading.RLock()
+        # Column arrays (SoA) mirroring the DataFrame, rebuilt lazily after mutations
+        self._names: Optional[np.ndarray] = None
+        self._lat: Optional[np.ndarray] = None
+        self._lon: Optional[np.ndarray] = None
+        self._xyz: Optional[np.ndarray] = None
+        self._weather_ok: Optional[np.ndarray] = None
+        # Bumped whenever the cached arrays are invalidated, so an async reader
+        # can tell whether the row it picked is still current
+        self._version = 0
+        # Content hash of the DataFrame for HTTP caching, computed lazily
+        self._etag: Optional[str] = None
+        # CSV serialization of the DataFrame, shared by exports and saves until the next change
+        self._csv_bytes: Optional[bytes] = None
+        # JSON document of all cities, reused by every read until the next change
+        self._json_bytes: Optional[bytes] = None
+        self._snapshot = Snapshot(
+            nrows=0, has_data=False, last_modified=datetime.now(timezone.utc)
+        )
+
+    @property
+    def df(self) -> Optional[pd.DataFrame]:
+        """
+        The cities DataFrame (None until data is loaded).
+        Cities buffered by add_city are appended on first access.
+        """
+        if self._pending:
+            self._flush_pending()
+        return self._df
+
+    @df.setter
+    def df(self, value: Optional[pd.DataFrame]) -> None:
+        self._replace_df(value)
+
+    @_locked
+    def _replace_df(
+        self,
+        value: Optional[pd.DataFrame],
+        name_index: Optional[dict[str, int]] = None,
+    ) -> None:
+        """
+        Swaps in a new DataFrame and invalidates everything derived from it.
+
+        Args:
+            value (pd.DataFrame | None): The new DataFrame.
+            name_index (dict[str, int], optional): Name -> row label map of `value`
+                if already known by the caller; otherwise rebuilt lazily on the next lookup.
+        """
+        self._df = value
+        self._pending = []
+        self._nrows = 0 if value is None else len(value)
+        self._next_label = int(value.index.max()) + 1 if self._nrows else 0
+        self._name_index = name_index
+        self._invalidate_cache()
+
+    @_locked
+    def _flush_pending(self) -> None:
+        """
+        Appends the cities buffered by add_city to the DataFrame with a single concat.
+        """
+        if not self._pending:
+            return
+
+        # Keep the labels add_cities handed out (already in the name index)
+        labels = pd.RangeIndex(self._next_label - len(self._pending), self._next_label)
+        new_rows = pd.DataFrame({"city_name": self._pending}, index=labels)
+        self._pending = []
+        self._df = pd.concat([self._df, new_rows])
+
+    def _get_name_index(self) -> dict[str, int]:
+        """
+        Returns the city name -> row label map, built once per DataFrame replacement.
+        """
+        if self._name_index is None:
+            df = self.df
+            self._name_index = dict(zip(df["city_name"].tolist(), df.index.tolist()))
+        return self._name_index
+
+    def snapshot(self) -> Snapshot:
+        """
+        Returns the current state summary (row count, data presence, last change).
+        """
+        return self._snapshot
+
+    def _invalidate_cache(self) -> None:
+        """
+        Drops the cached column arrays. They are rebuilt lazily on next use.
+        Must be called after any in-place mutation of the DataFrame.
+        """
+        self._names = None
+        self._lat = None
+        self._lon = None
+        self._xyz = None
+        self._weather_ok = None
+        self._version += 1
+        self._mark_modified()
+
+    def _mark_modified(self) -> None:
+        """
+        Records a change of the data: drops the ETag and publishes a new snapshot.
+        """
+        self._etag = None
+        self._csv_bytes = None
+        self._json_bytes = None
+        self._snapshot = Snapshot(
+            nrows=self._nrows,
+            has_data=self._nrows > 0,
+            last_modified=datetime.now(timezone.utc),
+        )
+
+    @property
+    @_locked
+    def etag(self) -> Optional[str]:
+        """
+        A strong ETag for the current data (None if no data is loaded).
+        Hashes the DataFrame content once per mutation.
+        """
+        if self.df is None:
+            return None
+
+        if self._etag is None:
+            row_hashes = pd.util.hash_pandas_object(self.df, index=False)
+            digest = hashlib.blake2b(row_hashes.to_numpy().tobytes(), digest_size=16)
+            digest.update(",".join(map(str, self.df.columns)).encode())
+            self._etag = digest.hexdigest()
+        return self._etag
+
+    def _rebuild_arrays(self) -> None:
+        """
+        Snapshots the DataFrame into contiguous NumPy arrays used by the hot paths:
+        city names, float64 latitude/longitude, their ECEF unit vectors
+        and a mask of rows that already have weather data.
+        Rows without coordinates hold NaN.
+        """
+        df = self.df
+        n = len(df)
+
+        self._names = df["city_name"].to_numpy()
+
+        if "latitude" in df.columns and "longitude" in df.columns:
+            self._lat = df["latitude"].to_numpy(dtype=np.float64)
+            self._lon = df["longitude"].to_numpy(dtype=np.float64)
+        else:
+            self._lat = np.full(n, np.nan)
+            self._lon = np.full(n, np.nan)
+        self._xyz = to_unit_vectors(self._lat, self._lon)
+
+        # Computed once per mutation and shared by all requests until the next one:
+        # freeze them so no request can alter another's view
+        for array in (self._names, self._lat, self._lon, self._xyz):
+            array.flags.writeable = False
+
+        if "weather" in df.columns and "temperature" in df.columns:
+            self._weather_ok = (
+                df[["weather", "temperature"]].notna().to_numpy().all(axis=1)
+            )
+        else:
+            self._weather_ok = np.zeros(n, dtype=bool)
+
+    @_locked
+    def _ensure_arrays(self) -> None:
+        """
+        Rebuilds the cached column arrays if a mutation invalidated them.
+        """
+        if self._names is None:
+            self._rebuild_arrays()
 
     def load_cities_from_csv_file(self, file_storage: FileStorage) -> None:
         """
         Reads a CSV from a FileStorage object (e.g., from an API request)
-        and updates the internal DataFrame with lowercase city names,
-        removing duplicates.
+        and updates the internal DataFrame with normalized (trimmed, lowercase)
+        city names, removing duplicates.
 
         Args:
             file_storage (FileStorage): The uploaded file containing CSV data.
@@ -35,39 +246,126 @@ class DataManager:
         Raises:
             ValueError: If the CSV is missing the 'city_name' column.
         """
-        file_bytes: bytes = file_storage.read()
-        file_stream = BytesIO(file_bytes)
-        temp_df = pd.read_csv(file_stream)
-
-        if "city_name" not in temp_df.columns:
-            raise ValueError("Missing 'city_name' column in CSV.")
-
-        temp_df = temp_df[["city_name"]].copy()
-        temp_df["city_name"] = temp_df["city_name"].astype(str).str.lower()
+        # Parse only the 'city_name' column, in chunks, straight from the upload stream
+        reader = pd.read_csv(
+            file_storage.stream,
+            usecols=lambda column: column == "city_name",
+            dtype={"city_name": str},
+            engine="c",
+            chunksize=CSV_CHUNK_SIZE,
+            # Names are plain text: skip NA-marker matching and date inference
+            na_filter=False,
+            cache_dates=False,
+        )
 
-        temp_df = temp_df.drop_duplicates(subset="city_name").reset_index(drop=True)
+        chunks: list[np.ndarray] = []
+        for chunk in reader:
+            if "city_name" not in chunk.columns:
+                raise ValueError("Missing 'city_name' column in CSV.")
+            # Uploads repeat names heavily: normalize each distinct spelling once
+            raw = pd.unique(chunk["city_name"].to_numpy())
+            names = [normalize_city_name(name) for name in raw]
+            # Blank cells are not cities
+            names = np.array([name for name in names if name], dtype=object)
+            chunks.append(pd.unique(names))
+
+        # Hash-based unique on the flat array keeps first-seen order, no index rewrite
+        names = (
+            pd.unique(np.concatenate(chunks)) if chunks else np.array([], dtype=object)
+        )
+        temp_df = pd.DataFrame({"city_name": names})
 
-        self.df = temp_df
+        self._replace_df(
+            temp_df, dict(zip(temp_df["city_name"].tolist(), range(len(temp_df))))
+        )
 
     def save_cities_to_csv(self, file_path: str = "data/cities.csv") -> None:
         """
         Saves the current DataFrame to a CSV file.
+        Reuses the serialization cached by to_csv_bytes when the data is unchanged.
 
         Args:
             file_path (str): The file path where the CSV will be saved.
 
+        Raises:
+            ValueError: If the DataFrame is None or empty.
+        """
+        body = self.to_csv_bytes()
+        with open(file_path, "wb") as file:
+            file.write(body)
+
+    @_locked
+    def to_csv_bytes(self) -> bytes:
+        """
+        Serializes the current DataFrame as CSV in memory (no filesystem access).
+        The result is cached until the next mutation.
+
+        Returns:
+            bytes: UTF-8 encoded CSV content, without the index.
+
         Raises:
             ValueError: If the DataFrame is None or empty.
         """
         if self.df is None or self.df.empty:
             raise ValueError("DataFrame is empty or uninitialized.")
 
-        self.df.to_csv(file_path, index=False)
+        if self._csv_bytes is None:
+            csv_text = self.df.to_csv(index=False, lineterminator="\n")
+            self._csv_bytes = csv_text.encode("utf-8")
+        return self._csv_bytes
+
+    @_locked
+    def to_json_bytes(self) -> bytes:
+        """
+        Serializes all cities as a JSON document {"cities": [...], "count": int},
+        with the records of to_send(). The result is cached until the next mutation.
+
+        Returns:
+            bytes: UTF-8 encoded JSON (missing values as null).
+
+        Raises:
+            ValueError: If the DataFrame is uninitialized or empty.
+        """
+        if self._json_bytes is None:
+            records = self.to_send()
+            self._json_bytes = orjson.dumps(
+                {"cities": records, "count": len(records)},
+                option=orjson.OPT_SERIALIZE_NUMPY,
+            )
+        return self._json_bytes
+
+    @_locked
+    def representation(self, fmt: str) -> tuple[str, datetime, bytes]:
+        """
+        Returns a serialized body together with the validators of the same data version,
+        read under one lock so a concurrent mutation cannot mix two versions.
+
+        Args:
+            fmt (str): "json" (see to_json_bytes) or "csv" (see to_csv_bytes).
+
+        Returns:
+            tuple[str, datetime, bytes]: (content ETag, last modification time, body).
+
+        Raises:
+            ValueError: If the DataFrame is uninitialized or empty, or `fmt` is unknown.
+        """
+        if fmt == "json":
+            body = self.to_json_bytes()
+        elif fmt == "csv":
+            body = self.to_csv_bytes()
+        else:
+            raise ValueError(f"Unknown format '{fmt}'.")
 
+        return self.etag, self._snapshot.last_modified, body
+
+    @_locked
     def add_city(self, city_name: str) -> bool:
         """
         Adds a new city to the DataFrame if it doesn't already exist.
-        Converts the city name to lowercase for consistency.
+        Normalizes the city name (trimmed, lowercase) for consistency.
+
+        The row is buffered and appended on the next read of `df`, so consecutive
+        adds cost one DataFrame copy in total instead of one each.
 
         Args:
             city_name (str): The name of the city to add.
@@ -78,22 +376,51 @@ class DataManager:
         Raises:
             ValueError: If the DataFrame is uninitialized.
         """
-        if self.df is None:
-            raise ValueError("DataFrame is not initialized. Load data first.")
+        return self.add_cities([city_name]) == 1
 
-        city_name_lower = city_name.lower()
+    @_locked
+    def add_cities(self, city_names: Iterable[str]) -> int:
+        """
+        Adds several cities at once, skipping names that already exist
+        (including repeats within `city_names`). Names are normalized like in add_city.
 
-        if city_name_lower in self.df["city_name"].values:
-            return False
+        The rows are buffered together and the caches invalidated once for the batch.
 
-        new_row = pd.DataFrame({"city_name": [city_name_lower]})
-        self.df = pd.concat([self.df, new_row], ignore_index=True)
-        return True
+        Args:
+            city_names (Iterable[str]): The names of the cities to add.
+
+        Returns:
+            int: Number of cities actually added.
+
+        Raises:
+            ValueError: If the DataFrame is uninitialized.
+        """
+        if self._df is None:
+            raise ValueError("DataFrame is not initialized. Load data first.")
 
+        names = self._get_name_index()
+        added = 0
+
+        for city_name in city_names:
+            key = normalize_city_name(city_name)
+            if key in names:
+                continue
+            # Buffered rows get the next labels once appended (see _flush_pending)
+            names[key] = self._next_label
+            self._next_label += 1
+            self._pending.append(key)
+            added += 1
+
+        if added:
+            self._nrows += added
+            self._invalidate_cache()
+        return added
+
+    @_locked
     def remove_city(self, city_name: str) -> None:
         """
-        Removes any row(s) from the DataFrame that match the given city name (case-insensitive).
-        The provided city_name is converted to lowercase before filtering.
+        Removes the row of the given city name (case-insensitive) from the DataFrame.
+        The provided city_name is normalized (trimmed, lowercase) before filtering.
 
         Args:
             city_name (str): The city name to remove.
@@ -104,34 +431,39 @@ class DataManager:
         if self.df is None:
             raise ValueError("DataFrame is not initialized. Load data first.")
 
-        city_name_lower = city_name.lower()
-        initial_length = len(self.df)
-
-        self.df = self.df[self.df["city_name"] != city_name_lower].reset_index(
-            drop=True
-        )
+        key = normalize_city_name(city_name)
+        names = self._get_name_index()
 
-        # If no rows were removed, raise an error
-        if len(self.df) == initial_length:
+        label = names.pop(key, None)
+        if label is None:
             raise ValueError(f"City '{city_name}' does not exist in the DataFrame.")
 
-    def to_send(self) -> str:
+        # Drop by label: the other rows keep theirs, so the name index stays valid
+        self._replace_df(self.df.drop(index=label), names)
+
+    def to_send(self) -> list[dict]:
         """
-        Returns the entire DataFrame in JSON format with orient='records'.
+        Returns the entire DataFrame as JSON-ready records (orient='records').
 
         Raises:
             ValueError: If the DataFrame is uninitialized or empty.
 
         Returns:
-            str: A JSON string representing the DataFrame rows.
+            list[dict]: One dict per row, mapping column names to plain Python values.
         """
-        if self.df is None or self.df.empty:
+        df = self.df
+        if df is None or df.empty:
             raise ValueError(
                 "DataFrame is uninitialized or empty. Nothing to export as JSON."
             )
 
-        return self.df.to_dict(orient="records")
+        # Convert each column once with tolist() and zip rows together:
+        # about twice as fast as to_dict(orient="records"), same output
+        columns = df.columns.tolist()
+        rows = zip(*(df[column].tolist() for column in columns))
+        return [dict(zip(columns, row)) for row in rows]
 
+    @_locked
     def update_df_with_enrichment(self, enriched_data: list[dict]) -> bool:
         """
         Replaces the DataFrame with enriched data (after enrich_all_cities).
@@ -140,16 +472,28 @@ class DataManager:
         Returns:
             bool: True if any enrichment failed (i.e., at least one row had an 'error' field), False otherwise.
         """
-        df = pd.DataFrame(enriched_data)
-
-        had_errors = "error" in df.columns and df["error"].notnull().any()
-
-        if "error" in df.columns:
-            df = df[df["error"].isnull()].drop(columns=["error"])
+        rows = [item for item in enriched_data if item.get("error") is None]
+        had_errors = len(rows) < len(enriched_data)
+
+        # Build the frame column by column from the successful rows only,
+        # instead of a row-wise frame that is then masked and copied
+        columns = dict.fromkeys(key for item in enriched_data for key in item)
+        columns.pop("error", None)
+
+        data = {}
+        for column in columns:
+            values = [item.get(column) for item in rows]
+            if column in FLOAT_COLUMNS:
+                # Straight to float64 (missing -> NaN), even when an API returns
+                # whole numbers (e.g. 20 °C): no object column, no astype pass
+                data[column] = np.array(values, dtype=np.float64)
+            else:
+                data[column] = pd.Series(values, dtype=object)
 
-        self.df = df.reset_index(drop=True)
+        self.df = pd.DataFrame(data)
         return had_errors
 
+    @_locked
     def update_enriched_city_data(self, enriched_data: dict) -> None:
         """
         Updates an existing city in the DataFrame with enriched data
@@ -168,17 +512,19 @@ class DataManager:
         if "city_name" not in enriched_data:
             raise ValueError("Missing 'city_name' in enriched data.")
 
-        city_name = enriched_data["city_name"].lower()
+        city_name = normalize_city_name(enriched_data["city_name"])
 
-        if city_name not in self.df["city_name"].values:
+        index = self._get_name_index().get(city_name)
+        if index is None:
             raise ValueError(f"City '{city_name}' not found in the DataFrame.")
 
-        index = self.df.index[self.df["city_name"] == city_name].tolist()[0]
-
         for key in ["latitude", "longitude", "weather", "temperature"]:
             if key in enriched_data:
                 self.df.at[index, key] = enriched_data[key]
 
+        self._invalidate_cache()
+
+    @_locked
     def get_cities_names(self) -> list[str]:
         """
         Returns a list of all city names currently in the DataFrame.
@@ -192,6 +538,10 @@ class DataManager:
         if self.df is None or self.df.empty:
             raise ValueError("DataFrame is uninitialized or empty.")
 
+        # Reuse the cached names array if the closest-city search already built it;
+        # otherwise read the column rather than rebuilding all arrays (trig included)
+        if self._names is not None:
+            return self._names.tolist()
         return self.df["city_name"].tolist()
 
     async def find_closest_city(
@@ -219,46 +569,67 @@ class DataManager:
         Raises:
             ValueError: If the DataFrame is uninitialized or missing coordinates.
         """
-        if self.df is None or self.df.empty:
-            raise ValueError("DataFrame is empty or uninitialized.")
-
-        if "latitude" not in self.df.columns or "longitude" not in self.df.columns:
-            raise ValueError(
-                "Missing coordinates: Enrich cities before calling this endpoint."
-            )
-
-        distances = []
-        for _, row in self.df.iterrows():
-            city_lat = row["latitude"]
-            city_lon = row["longitude"]
-
-            if pd.isna(city_lat) or pd.isna(city_lon):
-                distances.append(float("inf"))
-            else:
-                dist = haversine_distance(lat, lon, city_lat, city_lon)
-                distances.append(dist)
-
-        closest_idx = int(pd.Series(distances).idxmin())
-        closest_row = self.df.loc[closest_idx]
+        with self._lock:
+            if self.df is None or self.df.empty:
+                raise ValueError("DataFrame is empty or uninitialized.")
+
+            if "latitude" not in self.df.columns or "longitude" not in self.df.columns:
+                raise ValueError(
+                    "Missing coordinates: Enrich cities before calling this endpoint."
+                )
+
+            # Local references: mutations replace (not edit) the arrays and the frame,
+            # so this request keeps a consistent view of one data version
+            self._ensure_arrays()
+            version = self._version
+            df = self.df
+            names, lats, lons = self._names, self._lat, self._lon
+            xyz, weather_ok = self._xyz, self._weather_ok
+
+        # Nearest neighbor = largest cosine of the central angle: one matrix-vector product
+        cos_angle = xyz @ to_unit_vectors(lat, lon)
+        # Cities without coordinates can never be the closest
+        cos_angle = np.where(np.isnan(cos_angle), -np.inf, cos_angle)
+
+        closest_idx = int(cos_angle.argmax())
+        # arccos of a cosine close to 1 loses precision for nearby points:
+        # measure the winner alone with Haversine instead
+        distance_km = (
+            haversine_distance(lat, lon, lats[closest_idx], lons[closest_idx])
+            if np.isfinite(cos_angle[closest_idx])
+            else float("inf")
+        )
+        city_name = names[closest_idx]
+        closest_label = df.index[closest_idx]
+        weather = None
+        temperature = None
 
-        # Try to get existing weather data
-        weather = closest_row.get("weather")
-        temperature = closest_row.get("temperature")
+        # Use existing weather data when the row already has it
+        if weather_ok[closest_idx]:
+            weather = df.at[closest_label, "weather"]
+            temperature = df.at[closest_label, "temperature"]
 
         # If missing and service provided — fetch on demand
-        if (pd.isna(weather) or pd.isna(temperature)) and weather_service is not None:
+        elif weather_service is not None:
             result = await weather_service.fetch_weather(
-                closest_row["latitude"], closest_row["longitude"]
+                lats[closest_idx], lons[closest_idx]
             )
             if result:
                 weather, temperature = result
-                # Optional: update in df
-                self.df.at[closest_idx, "weather"] = weather
-                self.df.at[closest_idx, "temperature"] = temperature
+                # Optional: update in df, unless the rows changed during the fetch
+                with self._lock:
+                    if (
+                        self._version == version
+                        and self._get_name_index().get(city_name) == closest_label
+                    ):
+                        self.df.at[closest_label, "weather"] = weather
+                        self.df.at[closest_label, "temperature"] = temperature
+                        weather_ok[closest_idx] = True
+                        self._mark_modified()
 
         return {
-            "city_name": closest_row["city_name"],
-            "distance_km": round(distances[closest_idx], 2),
+            "city_name": city_name,
+            "distance_km": round(distance_km, 2),
             "weather": weather,
             "temperature": temperature,
         }
@@ -0,0 +1,33 @@
+import os
+
+# Production server config: gunicorn -c gunicorn.conf.py "app:create_app()"
+
+bind = os.getenv("BIND", "0.0.0.0:5005")
+
+# City data lives in process memory (DataManager), so all requests must hit
+# the same process: one worker, with threads for concurrent I/O-bound requests.
+# Async views run on their own event loop per request (asgiref), which does not
+# mix with gevent monkey-patching, hence the threaded worker.
+workers = 1
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 16))
+
+# Enrichment of large uploads waits on external APIs
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 120))
+keepalive = 5
+
+
+def post_worker_init(worker):
+    """
+    Runs the async views on uvloop when available. Flask (asgiref) creates a new
+    event loop per async request through the asyncio policy, so installing the
+    uvloop policy once per worker is enough.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        worker.log.info("uvloop not installed, using the default asyncio event loop")
+        return
+
+    uvloop.install()
+    worker.log.info("Using uvloop event loop")
@@ -1,8 +1,13 @@
 from typing import Optional, List
 from services.geolocation_service import GeolocationService
 from services.weather_service import WeatherService
+from services.http_client import shared_http_session
+from core.utils import normalize_city_name
 import asyncio
 
+# Cities enriched at the same time within one batch
+MAX_CONCURRENT_ENRICHMENTS = 32
+
 
 async def enrich_single_city(
     city_name: str, geo_service: GeolocationService, weather_service: WeatherService
@@ -45,21 +50,77 @@ async def enrich_single_city(
     }
 
 
-async def enrich_all_cities(city_names: List[str]) -> List[dict]:
+async def enrich_all_cities(
+    city_names: List[str],
+    geo_service: Optional[GeolocationService] = None,
+    weather_service: Optional[WeatherService] = None,
+) -> List[dict]:
     """
     Enriches a list of cities concurrently with coordinates and weather data.
+    At most MAX_CONCURRENT_ENRICHMENTS cities are in flight at once, and all
+    requests of the batch share one pooled HTTP client (keep-alive connections).
+    Names that normalize to the same city are enriched once.
 
     Args:
         city_names (List[str]): List of city names.
+        geo_service (GeolocationService, optional): Service for geolocation; pass the
+            application's long-lived instance so its cache is reused across batches.
+        weather_service (WeatherService, optional): Service for weather data, likewise.
 
     Returns:
-        List[dict]: List of enriched city data.
+        List[dict]: List of enriched city data, one per input name, in input order.
+    """
+    if geo_service is None:
+        geo_service = GeolocationService()
+    if weather_service is None:
+        weather_service = WeatherService()
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_ENRICHMENTS)
+
+    async def enrich_bounded(city: str) -> dict:
+        async with semaphore:
+            return await enrich_single_city(city, geo_service, weather_service)
+
+    # First spelling of each distinct city is the one sent to the APIs
+    unique: dict[str, str] = {}
+    for city in city_names:
+        unique.setdefault(normalize_city_name(city), city)
+
+    async with shared_http_session():
+        results = await asyncio.gather(
+            *(enrich_bounded(city) for city in unique.values())
+        )
+
+    # Fan the results back out, each under the name it was requested with
+    by_key = dict(zip(unique, results))
+    fanned_out = []
+    for city in city_names:
+        result = by_key[normalize_city_name(city)]
+        if result["city_name"] != city:
+            result = {**result, "city_name": city}
+        fanned_out.append(result)
+    return fanned_out
+
+
+def summarize_enrichment(results: List[dict]) -> dict:
     """
-    geo_service = GeolocationService()
-    weather_service = WeatherService()
+    Summarizes enrichment results in a single pass.
+
+    Args:
+        results (List[dict]): Output of enrich_all_cities.
 
-    tasks = [
-        enrich_single_city(city, geo_service, weather_service) for city in city_names
+    Returns:
+        dict: {
+            "enriched_count": int,
+            "failed_count": int,
+            "failed_cities": List[str]
+        }
+    """
+    failed_cities = [
+        item["city_name"] for item in results if item.get("error") is not None
     ]
-    results = await asyncio.gather(*tasks)
-    return results
+    return {
+        "enriched_count": len(results) - len(failed_cities),
+        "failed_count": len(failed_cities),
+        "failed_cities": failed_cities,
+    }
@@ -1,16 +1,28 @@
 import httpx
+import orjson
 import os
 from dotenv import load_dotenv
 import asyncio
 from typing import Optional
 from httpx import HTTPStatusError
-from asyncio import Semaphore
+from core.cache import AsyncTTLCache, SQLiteStore
+from core.utils import normalize_city_name
+from services.http_client import MAX_CONCURRENT_REQUESTS, PerLoopSemaphore, http_client
 
 load_dotenv()
 
 opencage_key = os.getenv("OPENCAGE_API_KEY")
+api_cache_path = os.getenv("API_CACHE_PATH")
 GEOCODE_URL = "https://api.opencagedata.com/geocode/v1/json"
 
+# City coordinates practically never change
+CACHE_MAX_SIZE = 10_000
+CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# Cached marker for cities the API has no results for; network failures stay uncached.
+# An empty tuple (not object()) so it survives the round trip through the disk cache
+_NOT_FOUND = ()
+
 
 class GeolocationService:
     """
@@ -18,25 +30,41 @@ class GeolocationService:
     for given city names using the OpenCage Geocoder API.
     """
 
-    # _instance = None
-
-    # def __new__(cls, *args, **kwargs):
-    #     if cls._instance is None:
-    #         cls._instance = super(GeolocationService, cls).__new__(cls)
-    #     return cls._instance
-
-    def __init__(self, api_key: str = opencage_key, max_concurrent_requests: int = 15):
-        # Prevent re-initialization
-        # if hasattr(self, "_initialized") and self._initialized:
-        #     return
-
+    def __init__(
+        self,
+        api_key: str = opencage_key,
+        max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS,
+        cache_path: Optional[str] = api_cache_path,
+    ):
         if not api_key:
             raise ValueError("Missing OpenCage API key.")
         self.api_key = api_key
-        self.semaphore = Semaphore(max_concurrent_requests)
-        # self._initialized = True
+        self.semaphore = PerLoopSemaphore(max_concurrent_requests)
+        # Optional on-disk second level, so restarts don't re-fetch known cities
+        store = SQLiteStore(cache_path, "geocode") if cache_path else None
+        self._cache = AsyncTTLCache(
+            maxsize=CACHE_MAX_SIZE, ttl=CACHE_TTL_SECONDS, store=store
+        )
 
     async def fetch_coordinates(self, city_name: str) -> Optional[tuple[float, float]]:
+        """
+        Fetches coordinates for a single city, served from cache when possible.
+        Concurrent lookups of the same city share a single API request, and
+        cities the API does not know are remembered as well.
+
+        Args:
+            city_name (str): The name of the city.
+
+        Returns:
+            Optional[tuple[float, float]]: (latitude, longitude) or None if not found.
+        """
+        key = normalize_city_name(city_name)
+        result = await self._cache.get_or_fetch(
+            key, lambda: self._request_coordinates(city_name)
+        )
+        return None if result == _NOT_FOUND else result
+
+    async def _request_coordinates(self, city_name: str) -> Optional[tuple]:
         """
         Sends an asynchronous API request to fetch coordinates for a single city.
         Uses semaphore to limit concurrent requests.
@@ -45,7 +73,8 @@ class GeolocationService:
             city_name (str): The name of the city.
 
         Returns:
-            Optional[tuple[float, float]]: (latitude, longitude) or None if not found.
+            Optional[tuple]: (latitude, longitude), _NOT_FOUND if the API
+                has no results, or None if the request failed.
         """
         params = {
             "q": city_name,
@@ -55,7 +84,7 @@ class GeolocationService:
         }
 
         async with self.semaphore:
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with http_client() as client:
                 try:
                     response = await client.get(GEOCODE_URL, params=params)
                     response.raise_for_status()
@@ -66,10 +95,10 @@ class GeolocationService:
                     print(f"[HTTP ERROR] Status error for {city_name}: {e.response.status_code}")
                     return None
 
-        data = response.json()
+        data = orjson.loads(response.content)
         if not data['results']:
             print(f"[INFO] No results found for city: {city_name}")
-            return None
+            return _NOT_FOUND
 
         geometry = data['results'][0]['geometry']
         return (geometry['lat'], geometry['lng'])
@@ -0,0 +1,119 @@
+import asyncio
+import importlib.util
+import os
+import ssl
+import weakref
+import httpx
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Optional
+
+HTTP_TIMEOUT_SECONDS = 10.0
+
+# Requests in flight per API within one request (event loop); concurrent requests
+# each get their own budget, so the process total can reach threads x this value
+MAX_CONCURRENT_REQUESTS = int(os.getenv("HTTP_MAX_CONCURRENT_REQUESTS", "15"))
+
+# HTTP/2 multiplexes concurrent requests over one connection; needs the optional `h2` package
+HTTP2_ENABLED = importlib.util.find_spec("h2") is not None
+
+# The shared client serves both the geocoding and the weather API
+HTTP_LIMITS = httpx.Limits(
+    max_connections=2 * MAX_CONCURRENT_REQUESTS,
+    max_keepalive_connections=2 * MAX_CONCURRENT_REQUESTS,
+)
+
+_ssl_context: Optional[ssl.SSLContext] = None
+
+# Client of the enclosing shared_http_session() block, visible to tasks spawned inside it
+_shared_client: ContextVar[Optional[httpx.AsyncClient]] = ContextVar(
+    "shared_http_client", default=None
+)
+
+
+class PerLoopSemaphore:
+    """
+    A concurrency limit that can be shared by services used from several event loops.
+
+    asyncio.Semaphore binds to the first loop that waits on it, while Flask runs each
+    async view on its own loop; this keeps one semaphore per running loop instead.
+
+    The limit therefore applies per request, not per process: concurrent requests
+    on different server threads do not share permits.
+    """
+
+    def __init__(self, value: int) -> None:
+        self.value = value
+        self._semaphores: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = weakref.WeakKeyDictionary()
+
+    def _current(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.value)
+        return semaphore
+
+    async def __aenter__(self) -> None:
+        await self._current().acquire()
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._current().release()
+
+
+def get_ssl_context() -> ssl.SSLContext:
+    """
+    Returns the process-wide TLS context shared by every client.
+
+    Loading the CA bundle dominates the cost of creating an httpx client (tens of ms),
+    and unlike the client itself the context is not tied to an event loop.
+    """
+    global _ssl_context
+    if _ssl_context is None:
+        _ssl_context = httpx.create_ssl_context()
+    return _ssl_context
+
+
+@asynccontextmanager
+async def shared_http_session() -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Opens one pooled HTTP client that every request made inside the block
+    (including tasks spawned from it) reuses, keeping connections alive across a batch.
+
+    Flask runs each async view on its own event loop, so the pool is scoped to
+    the batch and closed when the block exits rather than kept for the process.
+    """
+    client = _shared_client.get()
+    if client is not None:
+        yield client
+        return
+
+    async with httpx.AsyncClient(
+        timeout=HTTP_TIMEOUT_SECONDS,
+        limits=HTTP_LIMITS,
+        verify=get_ssl_context(),
+        http2=HTTP2_ENABLED,
+    ) as client:
+        token = _shared_client.set(client)
+        try:
+            yield client
+        finally:
+            _shared_client.reset(token)
+
+
+@asynccontextmanager
+async def http_client() -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Yields the client of the enclosing shared_http_session(),
+    or a short-lived client when called outside of one.
+    """
+    client = _shared_client.get()
+    if client is not None:
+        yield client
+        return
+
+    async with httpx.AsyncClient(
+        timeout=HTTP_TIMEOUT_SECONDS, verify=get_ssl_context()
+    ) as client:
+        yield client
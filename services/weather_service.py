@@ -1,17 +1,25 @@
 import httpx
+import orjson
 import os
 from dotenv import load_dotenv
 import asyncio
 from typing import Optional
 import math
 from httpx import HTTPStatusError
-from asyncio import Semaphore
+from core.cache import AsyncTTLCache, SQLiteStore
+from services.http_client import MAX_CONCURRENT_REQUESTS, PerLoopSemaphore, http_client
 
 load_dotenv()
 
 open_weather_key = os.getenv("OPENWEATHER_API_KEY")
+api_cache_path = os.getenv("API_CACHE_PATH")
 WEATHER_URL = "https://api.openweathermap.org/data/2.5/weather"
 
+# Current weather goes stale quickly; coordinates are rounded to ~100m for the key
+CACHE_MAX_SIZE = 10_000
+CACHE_TTL_SECONDS = 10 * 60
+CACHE_COORD_PRECISION = 3
+
 
 class WeatherService:
     """
@@ -19,29 +27,49 @@ class WeatherService:
     based on geographic coordinates using the OpenWeatherMap API.
     """
 
-    # _instance = None  # class-level singleton reference
-
-    # def __new__(cls, *args, **kwargs):
-    #     if cls._instance is None:
-    #         cls._instance = super(WeatherService, cls).__new__(cls)
-    #     return cls._instance
-
     def __init__(
-        self, api_key: str = open_weather_key, max_concurrent_requests: int = 15
+        self,
+        api_key: str = open_weather_key,
+        max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS,
+        cache_path: Optional[str] = api_cache_path,
     ):
-        # Prevent re-initialization
-        # if hasattr(self, "_initialized") and self._initialized:
-        #     return
-
         if not api_key:
             raise ValueError("Missing OpenWeatherMap API key.")
 
         self.api_key = api_key
-        self.semaphore = Semaphore(max_concurrent_requests)
-        # self._initialized = True
+        self.semaphore = PerLoopSemaphore(max_concurrent_requests)
+        # Optional on-disk second level, shared with the geocoding cache file
+        store = SQLiteStore(cache_path, "weather") if cache_path else None
+        self._cache = AsyncTTLCache(
+            maxsize=CACHE_MAX_SIZE, ttl=CACHE_TTL_SECONDS, store=store
+        )
 
     async def fetch_weather(
         self, lat: float, lon: float
+    ) -> Optional[tuple[str, float]]:
+        """
+        Fetches the current weather for given coordinates, served from cache when possible.
+        Concurrent lookups of the same location share a single API request.
+
+        Args:
+            lat (float): Latitude.
+            lon (float): Longitude.
+
+        Returns:
+            Optional[tuple[str, float]]: (description, temperature) or None if not found.
+        """
+        # Plain floats: NumPy scalars (from /closest-city) would give a different
+        # repr() key in the on-disk cache than the floats passed by enrichment
+        key = (
+            round(float(lat), CACHE_COORD_PRECISION),
+            round(float(lon), CACHE_COORD_PRECISION),
+        )
+        return await self._cache.get_or_fetch(
+            key, lambda: self._request_weather(lat, lon)
+        )
+
+    async def _request_weather(
+        self, lat: float, lon: float
     ) -> Optional[tuple[str, float]]:
         """
         Fetches the current weather description and temperature for given coordinates.
@@ -56,7 +84,7 @@ class WeatherService:
         params = {"lat": lat, "lon": lon, "appid": self.api_key, "units": "metric"}
 
         async with self.semaphore:
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with http_client() as client:
                 try:
                     response = await client.get(WEATHER_URL, params=params)
                     response.raise_for_status()
@@ -71,7 +99,7 @@ class WeatherService:
                     )
                     return None
 
-        data = response.json()
+        data = orjson.loads(response.content)
         if "weather" not in data or not data["weather"]:
             return None
 
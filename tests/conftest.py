@@ -0,0 +1,40 @@
+import asyncio
+import pytest
+from app import create_app
+from api import endpoints
+
+try:
+    import uvloop
+except ImportError:  # optional dependency (not available on Windows)
+    uvloop = None
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """
+    Runs the async tests on uvloop when it is installed, like the app under gunicorn.
+    """
+    if uvloop is not None:
+        return uvloop.EventLoopPolicy()
+    return asyncio.DefaultEventLoopPolicy()
+
+
+@pytest.fixture(scope="session")
+def app():
+    app = create_app()
+    app.config["TESTING"] = True
+    return app
+
+
+@pytest.fixture
+def client(app):
+    with app.test_client() as client:
+        yield client
+
+
+@pytest.fixture(autouse=True)
+def reset_cities():
+    # The app is shared by the whole session: start every test without loaded cities
+    endpoints.data_manager.df = None
+    yield
+    endpoints.data_manager.df = None
@@ -0,0 +1,116 @@
+import asyncio
+import threading
+from collections import OrderedDict
+
+import pytest
+from core.cache import AsyncTTLCache, SQLiteStore, TTLCache
+
+
+def test_ttl_cache_get_and_set():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("paris", (48.85, 2.35))
+
+    assert cache.get("paris") == (48.85, 2.35)
+    assert cache.get("london") is None
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=10, ttl=0)
+    cache.set("paris", (48.85, 2.35))
+
+    assert cache.get("paris") is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_get_is_atomic_with_concurrent_eviction():
+    cache = TTLCache(maxsize=1, ttl=60)
+    cache.set("a", 1)
+    writer = threading.Thread(target=cache.set, args=("b", 2))
+
+    class EvictOnLookup(OrderedDict):
+        def get(self, key, default=None):
+            entry = super().get(key, default)
+            # Another thread stores "b" (evicting "a") between the lookup and move_to_end
+            writer.start()
+            writer.join(timeout=0.2)
+            return entry
+
+    cache._data = EvictOnLookup(cache._data)
+
+    assert cache.get("a") == 1
+    writer.join()
+    assert list(cache._data) == ["b"]
+
+
+@pytest.mark.asyncio
+async def test_async_cache_coalesces_concurrent_fetches():
+    cache = AsyncTTLCache(maxsize=10, ttl=60)
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "sunny"
+
+    results = await asyncio.gather(*(cache.get_or_fetch("k", fetch) for _ in range(5)))
+    assert results == ["sunny"] * 5
+
+    assert await cache.get_or_fetch("k", fetch) == "sunny"
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_async_cache_does_not_store_none():
+    cache = AsyncTTLCache(maxsize=10, ttl=60)
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        return None
+
+    assert await cache.get_or_fetch("k", fetch) is None
+    assert await cache.get_or_fetch("k", fetch) is None
+    assert calls == 2
+
+
+def test_sqlite_store_persists_and_expires(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    SQLiteStore(path, "geocode").set("paris", (48.85, 2.35), ttl=60)
+    SQLiteStore(path, "geocode").set("london", (51.5, -0.12), ttl=0)
+
+    store = SQLiteStore(path, "geocode")
+    assert store.get("paris") == (48.85, 2.35)
+    assert store.get("london") is None
+    assert SQLiteStore(path, "weather").get("paris") is None
+
+
+@pytest.mark.asyncio
+async def test_async_cache_reads_through_store_after_restart(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        return (48.85, 2.35)
+
+    first = AsyncTTLCache(maxsize=10, ttl=60, store=SQLiteStore(path, "geocode"))
+    await first.get_or_fetch("paris", fetch)
+
+    restarted = AsyncTTLCache(maxsize=10, ttl=60, store=SQLiteStore(path, "geocode"))
+    assert await restarted.get_or_fetch("paris", fetch) == (48.85, 2.35)
+    assert calls == 1
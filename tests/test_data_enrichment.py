@@ -1,47 +1,54 @@
 import pytest
 import asyncio
-from services.data_enrichment_service import enrich_single_city, enrich_all_cities
-
-
-class MockGeoService:
-    async def fetch_coordinates(self, city_name):
-        if city_name == "fail_city":
-            return None
-        return (1.23, 4.56)
+from unittest.mock import AsyncMock
+from services.data_enrichment_service import (
+    enrich_single_city,
+    enrich_all_cities,
+    summarize_enrichment,
+)
+
+
+@pytest.fixture
+def geo_service():
+    service = AsyncMock()
+    service.fetch_coordinates.side_effect = lambda city_name: (
+        None if city_name == "fail_city" else (1.23, 4.56)
+    )
+    return service
 
 
-class MockWeatherService:
-    async def fetch_weather(self, lat, lon):
-        if lat == -1:
-            return None
-        return ("sunny", 25.5)
+@pytest.fixture
+def weather_service():
+    service = AsyncMock()
+    service.fetch_weather.side_effect = lambda lat, lon: (
+        None if lat == -1 else ("sunny", 25.5)
+    )
+    return service
 
 
 @pytest.mark.asyncio
-async def test_enrich_single_city_success():
-    result = await enrich_single_city("paris", MockGeoService(), MockWeatherService())
+async def test_enrich_single_city_success(geo_service, weather_service):
+    result = await enrich_single_city("paris", geo_service, weather_service)
     assert result["city_name"] == "paris"
     assert result["latitude"] == 1.23
     assert result["weather"] == "sunny"
 
 
 @pytest.mark.asyncio
-async def test_enrich_single_city_coordinates_fail():
-    result = await enrich_single_city(
-        "fail_city", MockGeoService(), MockWeatherService()
-    )
+async def test_enrich_single_city_coordinates_fail(geo_service, weather_service):
+    result = await enrich_single_city("fail_city", geo_service, weather_service)
     assert result["city_name"] == "fail_city"
     assert "error" in result
     assert result["error"] == "Failed to get coordinates"
+    weather_service.fetch_weather.assert_not_awaited()
 
 
 @pytest.mark.asyncio
-async def test_enrich_single_city_weather_fail():
-    class BadWeather(MockWeatherService):
-        async def fetch_weather(self, lat, lon):
-            return None
+async def test_enrich_single_city_weather_fail(geo_service, weather_service):
+    weather_service.fetch_weather.side_effect = None
+    weather_service.fetch_weather.return_value = None
 
-    result = await enrich_single_city("city", MockGeoService(), BadWeather())
+    result = await enrich_single_city("city", geo_service, weather_service)
     assert result["city_name"] == "city"
     assert "error" in result
     assert result["error"] == "Failed to get weather"
@@ -70,3 +77,30 @@ async def test_enrich_all_cities_mixed_results(monkeypatch):
     assert len(results) == 2
     assert any("error" in r for r in results)
     assert any(r["city_name"] == "fail_city" for r in results)
+
+
+@pytest.mark.asyncio
+async def test_enrich_all_cities_enriches_duplicates_once(geo_service, weather_service):
+    results = await enrich_all_cities(
+        ["Paris", "paris ", "london", "Paris"], geo_service, weather_service
+    )
+
+    assert geo_service.fetch_coordinates.await_count == 2
+    assert [r["city_name"] for r in results] == ["Paris", "paris ", "london", "Paris"]
+    assert all(r["weather"] == "sunny" for r in results)
+
+
+def test_summarize_enrichment_counts_failures():
+    results = [
+        {"city_name": "paris", "latitude": 1.23, "longitude": 4.56},
+        {"city_name": "fail_city", "error": "Failed to get coordinates"},
+        {"city_name": "london", "error": None},
+    ]
+
+    summary = summarize_enrichment(results)
+
+    assert summary == {
+        "enriched_count": 2,
+        "failed_count": 1,
+        "failed_cities": ["fail_city"],
+    }
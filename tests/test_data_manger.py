@@ -1,6 +1,7 @@
 import pytest
 import pandas as pd
 from data.data_manager import DataManager
+from core.utils import haversine_distance
 from werkzeug.datastructures import FileStorage
 from io import BytesIO
 
@@ -16,6 +17,42 @@ def test_add_city_to_initialized_df():
     assert manager.df.iloc[0]["city_name"] == "tel aviv"
 
 
+def test_add_city_duplicate_is_detected_after_normalization():
+    manager = DataManager()
+    manager.df = pd.DataFrame({"city_name": ["tel aviv"]})
+
+    assert manager.add_city("  Tel Aviv ") is False
+    assert manager.add_city("Paris") is True
+    assert manager.add_city("PARIS") is False
+    assert manager.df["city_name"].tolist() == ["tel aviv", "paris"]
+
+
+def test_add_city_batches_rows_until_read():
+    manager = DataManager()
+    manager.df = pd.DataFrame(
+        {"city_name": ["tel aviv"], "latitude": [32.0853], "longitude": [34.7818]}
+    )
+
+    for name in ["Paris", "London", "Rome"]:
+        manager.add_city(name)
+
+    assert manager.snapshot().nrows == 4
+    assert manager.df["city_name"].tolist() == ["tel aviv", "paris", "london", "rome"]
+    assert manager.df.index.tolist() == [0, 1, 2, 3]
+    assert manager.df["latitude"].isna().tolist() == [False, True, True, True]
+
+
+def test_add_cities_skips_existing_and_repeated_names():
+    manager = DataManager()
+    manager.df = pd.DataFrame({"city_name": ["tel aviv"]})
+
+    added = manager.add_cities(["Paris", "TEL AVIV", " paris", "London"])
+
+    assert added == 2
+    assert manager.snapshot().nrows == 3
+    assert manager.df["city_name"].tolist() == ["tel aviv", "paris", "london"]
+
+
 # Test adding a city when the DataFrame is not initialized should raise an error
 def test_add_city_to_uninitialized_df_raises():
     manager = DataManager()
@@ -24,6 +61,22 @@ def test_add_city_to_uninitialized_df_raises():
         manager.add_city("Tel Aviv")
 
 
+def test_snapshot_tracks_mutations():
+    manager = DataManager()
+    initial = manager.snapshot()
+    assert initial.nrows == 0
+    assert initial.has_data is False
+
+    manager.df = pd.DataFrame({"city_name": ["tel aviv"]})
+    manager.add_city("paris")
+    assert manager.snapshot().nrows == 2
+    assert manager.snapshot().has_data is True
+
+    manager.remove_city("tel aviv")
+    assert manager.snapshot().nrows == 1
+    assert manager.snapshot().last_modified >= initial.last_modified
+
+
 # Test removing a city that exists in the DataFrame
 def test_remove_city_success():
     manager = DataManager()
@@ -60,6 +113,48 @@ def test_load_cities_from_csv_file_success():
     assert manager.df.iloc[0]["city_name"] == "tel aviv"
 
 
+def test_load_cities_from_csv_file_ignores_other_columns_and_duplicates():
+    csv_data = b"country,city_name\nfrance,Paris\nfrance,paris\nuk,London"
+    file_storage = FileStorage(stream=BytesIO(csv_data), filename="cities.csv")
+
+    manager = DataManager()
+    manager.load_cities_from_csv_file(file_storage)
+
+    assert list(manager.df.columns) == ["city_name"]
+    assert manager.df["city_name"].tolist() == ["paris", "london"]
+
+
+def test_load_cities_from_csv_file_skips_blank_names():
+    csv_data = b"city_name,country\n,israel\n  ,uk\nParis,france\nNA,namibia"
+    file_storage = FileStorage(stream=BytesIO(csv_data), filename="cities.csv")
+    manager = DataManager()
+
+    manager.load_cities_from_csv_file(file_storage)
+
+    assert manager.df["city_name"].tolist() == ["paris", "na"]
+
+
+def test_save_cities_to_csv_reflects_latest_data(tmp_path):
+    manager = DataManager()
+    manager.df = pd.DataFrame({"city_name": ["tel aviv"]})
+    file_path = tmp_path / "cities.csv"
+
+    manager.save_cities_to_csv(str(file_path))
+    assert file_path.read_bytes() == manager.to_csv_bytes() == b"city_name\ntel aviv\n"
+
+    manager.add_city("paris")
+    manager.save_cities_to_csv(str(file_path))
+    assert file_path.read_bytes() == b"city_name\ntel aviv\nparis\n"
+
+
+def test_load_cities_from_csv_file_missing_column_raises():
+    file_storage = FileStorage(stream=BytesIO(b"name\nparis"), filename="cities.csv")
+
+    manager = DataManager()
+    with pytest.raises(ValueError):
+        manager.load_cities_from_csv_file(file_storage)
+
+
 def test_get_cities_names_success():
     manager = DataManager()
     manager.df = pd.DataFrame({"city_name": ["tel aviv", "paris"]})
@@ -70,6 +165,17 @@ def test_get_cities_names_success():
     assert names == ["tel aviv", "paris"]
 
 
+def test_get_cities_names_does_not_rebuild_geometry():
+    manager = DataManager()
+    manager.df = pd.DataFrame(
+        {"city_name": ["tel aviv"], "latitude": [32.0853], "longitude": [34.7818]}
+    )
+    manager.add_city("paris")
+
+    assert manager.get_cities_names() == ["tel aviv", "paris"]
+    assert manager._xyz is None
+
+
 def test_get_cities_names_raises_on_empty_df():
     manager = DataManager()
     manager.df = pd.DataFrame(columns=["city_name"])
@@ -99,6 +205,75 @@ def test_update_enriched_city_data_success():
     assert row["temperature"] == 27.5
 
 
+def test_update_enriched_city_data_targets_added_city():
+    manager = DataManager()
+    manager.df = pd.DataFrame({"city_name": ["tel aviv", "paris"]}, index=[10, 20])
+
+    manager.add_city("Rome")
+    manager.update_enriched_city_data({"city_name": "rome", "latitude": 41.9})
+    manager.update_enriched_city_data({"city_name": "paris", "latitude": 48.85})
+
+    assert manager.df["latitude"].tolist()[1:] == [48.85, 41.9]
+    assert pd.isna(manager.df["latitude"].iloc[0])
+
+
+def test_to_send_returns_plain_records():
+    manager = DataManager()
+    manager.df = pd.DataFrame(
+        {"city_name": ["paris", "nowhere"], "latitude": [48.85, None]}
+    )
+
+    records = manager.to_send()
+
+    assert records[0] == {"city_name": "paris", "latitude": 48.85}
+    assert type(records[0]["latitude"]) is float
+    assert pd.isna(records[1]["latitude"])
+
+
+def test_to_json_bytes_is_cached_until_mutation():
+    manager = DataManager()
+    manager.df = pd.DataFrame({"city_name": ["paris"], "latitude": [None]})
+
+    body = manager.to_json_bytes()
+    assert body == b'{"cities":[{"city_name":"paris","latitude":null}],"count":1}'
+    assert manager.to_json_bytes() is body
+
+    manager.update_enriched_city_data({"city_name": "paris", "latitude": 48.85})
+    assert b"48.85" in manager.to_json_bytes()
+
+
+def test_representation_returns_validators_of_the_same_version():
+    manager = DataManager()
+    manager.df = pd.DataFrame({"city_name": ["paris"]})
+
+    etag, last_modified, body = manager.representation("csv")
+    assert etag == manager.etag
+    assert last_modified == manager.snapshot().last_modified
+    assert body == b"city_name\nparis\n"
+
+    manager.add_city("london")
+    new_etag, _, new_body = manager.representation("json")
+    assert new_etag != etag
+    assert b"london" in new_body
+
+    with pytest.raises(ValueError):
+        manager.representation("xml")
+
+
+def test_remove_then_add_keeps_row_labels_consistent():
+    manager = DataManager()
+    manager.df = pd.DataFrame({"city_name": ["tel aviv", "paris", "london"]})
+
+    manager.remove_city("paris")
+    manager.add_city("rome")
+    manager.update_enriched_city_data({"city_name": "london", "latitude": 51.5})
+    manager.update_enriched_city_data({"city_name": "rome", "latitude": 41.9})
+
+    assert manager.df["city_name"].tolist() == ["tel aviv", "london", "rome"]
+    assert manager.df["latitude"].tolist()[1:] == [51.5, 41.9]
+    assert manager.df.index.is_unique
+
+
 def test_update_df_with_enrichment_filters_errors():
     manager = DataManager()
 
@@ -119,3 +294,115 @@ def test_update_df_with_enrichment_filters_errors():
     assert len(manager.df) == 1
     assert "error" not in manager.df.columns
     assert manager.df.iloc[0]["city_name"] == "paris"
+
+
+@pytest.mark.asyncio
+async def test_find_closest_city_skips_missing_coordinates():
+    manager = DataManager()
+    manager.df = pd.DataFrame(
+        {
+            "city_name": ["nowhere", "tel aviv", "jerusalem"],
+            "latitude": [None, 32.0853, 31.7683],
+            "longitude": [None, 34.7818, 35.2137],
+            "weather": [None, "clear sky", "cloudy"],
+            "temperature": [None, 27.5, 22.0],
+        }
+    )
+
+    result = await manager.find_closest_city(lat=32.08, lon=34.78)
+
+    assert result["city_name"] == "tel aviv"
+    assert result["distance_km"] < 1
+    assert result["weather"] == "clear sky"
+
+
+@pytest.mark.asyncio
+async def test_find_closest_city_reports_precise_short_distance():
+    manager = DataManager()
+    manager.df = pd.DataFrame(
+        {"city_name": ["tel aviv"], "latitude": [32.0853], "longitude": [34.7818]}
+    )
+
+    result = await manager.find_closest_city(lat=32.0853, lon=34.7918)
+
+    assert result["distance_km"] == round(
+        haversine_distance(32.0853, 34.7918, 32.0853, 34.7818), 2
+    )
+
+
+@pytest.mark.asyncio
+async def test_find_closest_city_sees_newly_enriched_city():
+    manager = DataManager()
+    manager.df = pd.DataFrame(
+        {"city_name": ["jerusalem"], "latitude": [31.7683], "longitude": [35.2137]}
+    )
+    await manager.find_closest_city(lat=32.08, lon=34.78)
+
+    manager.add_city("tel aviv")
+    manager.update_enriched_city_data(
+        {"city_name": "tel aviv", "latitude": 32.0853, "longitude": 34.7818}
+    )
+    result = await manager.find_closest_city(lat=32.08, lon=34.78)
+
+    assert result["city_name"] == "tel aviv"
+
+
+@pytest.mark.asyncio
+async def test_find_closest_city_skips_write_back_if_rows_changed_during_fetch():
+    manager = DataManager()
+    manager.df = pd.DataFrame(
+        {
+            "city_name": ["tel aviv", "jerusalem"],
+            "latitude": [32.0853, 31.7683],
+            "longitude": [34.7818, 35.2137],
+        }
+    )
+
+    class RemovingWeatherService:
+        async def fetch_weather(self, lat, lon):
+            # Another request removes the city while the weather is being fetched
+            manager.remove_city("tel aviv")
+            return "clear sky", 27.5
+
+    result = await manager.find_closest_city(
+        lat=32.08, lon=34.78, weather_service=RemovingWeatherService()
+    )
+
+    assert result["city_name"] == "tel aviv"
+    assert result["weather"] == "clear sky"
+    assert manager.df["city_name"].tolist() == ["jerusalem"]
+    assert "weather" not in manager.df.columns
+
+
+def test_update_df_with_enrichment_keeps_float_columns():
+    manager = DataManager()
+
+    manager.update_df_with_enrichment(
+        [
+            {
+                "city_name": "paris",
+                "latitude": 48,
+                "longitude": 2,
+                "weather": "cloudy",
+                "temperature": 18,
+            }
+        ]
+    )
+
+    for column in ("latitude", "longitude", "temperature"):
+        assert manager.df[column].dtype == "float64"
+
+
+def test_update_df_with_enrichment_missing_numbers_become_nan():
+    manager = DataManager()
+
+    manager.update_df_with_enrichment(
+        [
+            {"city_name": "paris", "latitude": 48.85, "temperature": None},
+            {"city_name": "rome", "latitude": None, "temperature": 21},
+        ]
+    )
+
+    assert manager.df["temperature"].dtype == "float64"
+    assert manager.df["latitude"].isna().tolist() == [False, True]
+    assert manager.df["temperature"].tolist()[1] == 21.0
@@ -1,14 +1,4 @@
 import io
-import pytest
-from app import create_app
-
-
-@pytest.fixture
-def client():
-    app = create_app()
-    app.config["TESTING"] = True
-    with app.test_client() as client:
-        yield client
 
 
 def test_enrich_and_error_handling_flow(client):
@@ -0,0 +1,98 @@
+import gzip
+import numpy as np
+import pandas as pd
+import pytest
+from api import endpoints
+
+
+@pytest.fixture
+def loaded_cities():
+    endpoints.data_manager.df = pd.DataFrame(
+        {
+            "city_name": ["tel aviv", "paris"],
+            "latitude": [32.0853, 48.8566],
+            "longitude": [34.7818, 2.3522],
+            "weather": ["clear sky", "cloudy"],
+            "temperature": [27.5, 18.2],
+        }
+    )
+
+
+def test_get_all_cities_conditional_request(client, loaded_cities):
+    res = client.get("/get-all-cities")
+    assert res.status_code == 200
+    etag = res.headers["ETag"]
+    assert res.headers["Last-Modified"]
+
+    res = client.get("/get-all-cities", headers={"If-None-Match": etag})
+    assert res.status_code == 304
+    assert res.data == b""
+
+    endpoints.data_manager.remove_city("paris")
+    res = client.get("/get-all-cities", headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.headers["ETag"] != etag
+    assert res.get_json()["count"] == 1
+
+
+def test_get_all_cities_as_csv(client, loaded_cities):
+    json_res = client.get("/get-all-cities")
+    res = client.get("/get-all-cities", headers={"Accept": "text/csv"})
+
+    assert res.status_code == 200
+    assert res.mimetype == "text/csv"
+    assert res.data.decode().splitlines()[0] == (
+        "city_name,latitude,longitude,weather,temperature"
+    )
+    assert res.headers["ETag"] != json_res.headers["ETag"]
+
+
+def test_export_cities_conditional_request(client, loaded_cities):
+    res = client.get("/export-cities")
+    assert res.status_code == 200
+    etag = res.headers["ETag"]
+
+    res = client.get("/export-cities", headers={"If-None-Match": etag})
+    assert res.status_code == 304
+
+
+def test_export_cities_builds_csv_in_memory(client, loaded_cities, monkeypatch):
+    def fail_save(*args, **kwargs):
+        raise AssertionError("export must not write to disk")
+
+    monkeypatch.setattr(endpoints.data_manager, "save_cities_to_csv", fail_save)
+
+    res = client.get("/export-cities")
+    assert res.status_code == 200
+    assert res.mimetype == "text/csv"
+    assert res.data.decode().splitlines()[1].startswith("tel aviv,32.0853")
+
+
+def test_export_cities_supports_range_requests(client, loaded_cities):
+    full = client.get("/export-cities").data
+
+    res = client.get("/export-cities", headers={"Range": "bytes=0-8"})
+
+    assert res.status_code == 206
+    assert res.data == full[:9] == b"city_name"
+    assert res.headers["Content-Range"] == f"bytes 0-8/{len(full)}"
+
+
+def test_export_cities_gzip_for_large_exports(client, monkeypatch):
+    monkeypatch.setattr(endpoints, "EXPORT_GZIP_MIN_BYTES", 10)
+    endpoints.data_manager.df = pd.DataFrame({"city_name": ["tel aviv", "paris"]})
+
+    res = client.get("/export-cities", headers={"Accept-Encoding": "gzip"})
+    assert res.status_code == 200
+    assert res.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(res.data) == b"city_name\ntel aviv\nparis\n"
+
+
+def test_json_responses_serialize_numpy_values(client):
+    app = client.application
+
+    with app.app_context():
+        res = app.json.response({"temperature": np.float64(18.5), "missing": np.nan})
+
+    assert res.mimetype == "application/json"
+    assert res.get_json() == {"temperature": 18.5, "missing": None}
@@ -1,5 +1,6 @@
 import pytest
 import httpx
+import orjson
 from services.geolocation_service import GeolocationService
 
 
@@ -13,6 +14,10 @@ async def test_fetch_coordinates_success(monkeypatch):
             def raise_for_status(self):
                 pass
 
+            @property
+            def content(self):
+                return orjson.dumps(self.json())
+
             def json(self):
                 return {"results": [{"geometry": {"lat": 32.0853, "lng": 34.7818}}]}
 
@@ -36,6 +41,10 @@ async def test_fetch_coordinates_not_found(monkeypatch):
             def raise_for_status(self):
                 pass
 
+            @property
+            def content(self):
+                return orjson.dumps(self.json())
+
             def json(self):
                 return {"results": []}
 
@@ -61,6 +70,10 @@ async def test_fetch_coordinates_api_error(monkeypatch):
                     "Internal Server Error", request=None, response=self
                 )
 
+            @property
+            def content(self):
+                return orjson.dumps(self.json())
+
             def json(self):
                 return {}
 
@@ -84,6 +97,10 @@ async def test_fetch_coordinates_prints_info_when_not_found(monkeypatch, capfd):
             def raise_for_status(self):
                 pass
 
+            @property
+            def content(self):
+                return orjson.dumps(self.json())
+
             def json(self):
                 return {"results": []}
 
@@ -96,3 +113,84 @@ async def test_fetch_coordinates_prints_info_when_not_found(monkeypatch, capfd):
 
     out, _ = capfd.readouterr()
     assert "[INFO] No results found for city: NotARealCity" in out
+
+
+@pytest.mark.asyncio
+async def test_fetch_coordinates_cached_by_normalized_name(monkeypatch):
+    calls = 0
+
+    async def mock_get(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+
+        class MockResponse:
+            status_code = 200
+
+            def raise_for_status(self):
+                pass
+
+            @property
+            def content(self):
+                return orjson.dumps(self.json())
+
+            def json(self):
+                return {"results": [{"geometry": {"lat": 48.8566, "lng": 2.3522}}]}
+
+        return MockResponse()
+
+    monkeypatch.setattr("httpx.AsyncClient.get", mock_get)
+
+    service = GeolocationService()
+    first = await service.fetch_coordinates("Paris")
+    second = await service.fetch_coordinates("  paris ")
+
+    assert first == second == (48.8566, 2.3522)
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_coordinates_caches_unknown_city(monkeypatch):
+    calls = 0
+
+    async def mock_get(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+
+        class MockResponse:
+            status_code = 200
+
+            def raise_for_status(self):
+                pass
+
+            @property
+            def content(self):
+                return orjson.dumps(self.json())
+
+            def json(self):
+                return {"results": []}
+
+        return MockResponse()
+
+    monkeypatch.setattr("httpx.AsyncClient.get", mock_get)
+
+    service = GeolocationService()
+    assert await service.fetch_coordinates("NotARealCity") is None
+    assert await service.fetch_coordinates("notarealcity") is None
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_coordinates_does_not_cache_network_errors(monkeypatch):
+    calls = 0
+
+    async def mock_get(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        raise httpx.ConnectError("connection refused")
+
+    monkeypatch.setattr("httpx.AsyncClient.get", mock_get)
+
+    service = GeolocationService()
+    assert await service.fetch_coordinates("Paris") is None
+    assert await service.fetch_coordinates("Paris") is None
+    assert calls == 2
@@ -0,0 +1,59 @@
+import asyncio
+import pytest
+from services.http_client import (
+    PerLoopSemaphore,
+    get_ssl_context,
+    http_client,
+    shared_http_session,
+)
+
+
+@pytest.mark.asyncio
+async def test_http_client_reuses_shared_session_client():
+    async with shared_http_session() as shared:
+
+        async def get_client():
+            async with http_client() as client:
+                return client
+
+        clients = await asyncio.gather(get_client(), get_client())
+
+    assert clients == [shared, shared]
+    assert shared.is_closed
+
+
+@pytest.mark.asyncio
+async def test_http_client_outside_session_is_short_lived():
+    async with http_client() as client:
+        assert not client.is_closed
+    assert client.is_closed
+
+
+def test_ssl_context_is_built_once():
+    assert get_ssl_context() is get_ssl_context()
+
+
+def test_per_loop_semaphore_works_across_event_loops():
+    semaphore = PerLoopSemaphore(1)
+    peak = 0
+    active = 0
+
+    async def worker():
+        nonlocal peak, active
+        async with semaphore:
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0)
+            active -= 1
+
+    async def batch():
+        await asyncio.gather(worker(), worker(), worker())
+
+    # A plain asyncio.Semaphore would fail here once contended on a second loop
+    for _ in range(2):
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(batch())
+        finally:
+            loop.close()
+    assert peak == 1
@@ -22,6 +22,18 @@ def test_is_valid_coordinates_non_numeric():
     assert is_valid_coordinates(None, 34.78) is False
     assert is_valid_coordinates(32.08, None) is False
     assert is_valid_coordinates([32.08], 34.78) is False
+    assert is_valid_coordinates(10**400, 34.78) is False
+
+
+def test_is_valid_coordinates_numeric_strings():
+    assert is_valid_coordinates("32.08", "34.78") is True
+    assert is_valid_coordinates("95", "34.78") is False
+
+
+def test_is_valid_coordinates_non_finite():
+    assert is_valid_coordinates(float("nan"), 34.78) is False
+    assert is_valid_coordinates(32.08, float("inf")) is False
+    assert is_valid_coordinates("nan", "nan") is False
 
 
 def test_haversine_distance_zero():
@@ -1,5 +1,7 @@
 import pytest
 import httpx
+import numpy as np
+import orjson
 from services.weather_service import WeatherService
 
 
@@ -13,6 +15,10 @@ async def test_fetch_weather_success(monkeypatch):
             def raise_for_status(self):
                 pass  # simulate OK
 
+            @property
+            def content(self):
+                return orjson.dumps(self.json())
+
             def json(self):
                 return {
                     "weather": [{"description": "clear sky"}],
@@ -38,6 +44,10 @@ async def test_fetch_weather_failure(monkeypatch):
             def raise_for_status(self):
                 raise httpx.HTTPStatusError("Not Found", request=None, response=self)
 
+            @property
+            def content(self):
+                return orjson.dumps(self.json())
+
             def json(self):
                 return {}
 
@@ -48,3 +58,37 @@ async def test_fetch_weather_failure(monkeypatch):
     service = WeatherService()
     result = await service.fetch_weather(0, 0)
     assert result is None
+
+
+@pytest.mark.asyncio
+async def test_fetch_weather_store_key_ignores_numpy_scalars(monkeypatch, tmp_path):
+    calls = []
+
+    async def mock_get(*args, **kwargs):
+        calls.append(kwargs["params"])
+
+        class MockResponse:
+            status_code = 200
+
+            def raise_for_status(self):
+                pass
+
+            @property
+            def content(self):
+                return orjson.dumps(
+                    {"weather": [{"description": "clear sky"}], "main": {"temp": 27.5}}
+                )
+
+        return MockResponse()
+
+    monkeypatch.setattr("httpx.AsyncClient.get", mock_get)
+    cache_path = str(tmp_path / "cache.sqlite")
+
+    # Enrichment stores plain floats...
+    await WeatherService(cache_path=cache_path).fetch_weather(32.0853, 34.7818)
+    # ...and /closest-city reads back with NumPy scalars after a restart
+    service = WeatherService(cache_path=cache_path)
+    result = await service.fetch_weather(np.float64(32.0853), np.float64(34.7818))
+
+    assert result == ("clear sky", 27.5)
+    assert len(calls) == 1